@@ -4,6 +4,7 @@ All sensitive settings should be loaded from environment variables.
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
+from functools import lru_cache
 from typing import Optional
 import os
 
@@ -28,6 +29,9 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # CORS allowlist; replace the wildcard with explicit origins in production
+    CORS_ORIGINS: tuple = ("*",)
+
     # Encryption
     ENCRYPTION_KEY: str = "dev-encryption-key-change-in-production"
     
@@ -42,6 +46,10 @@ class Settings(BaseSettings):
     
     # HIPAA Compliance
     AUDIT_LOG_RETENTION_DAYS: int = 2555  # 7 years as per HIPAA requirements
+    # Audit buffer: events are flushed every interval or once the buffer
+    # reaches max size, whichever comes first
+    AUDIT_BUFFER_FLUSH_INTERVAL: float = 0.05
+    AUDIT_BUFFER_MAX_SIZE: int = 128
     ENCRYPTION_AT_REST: bool = True
     ENCRYPTION_IN_TRANSIT: bool = True
     
@@ -58,6 +66,27 @@ class Settings(BaseSettings):
     ND_RECORD_RETENTION_DAYS: int = 2555
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the application settings singleton.
+
+    Cached so the .env file and environment variables are only parsed
+    once per process; use as a FastAPI dependency via Depends(get_settings).
+
+    When USE_FROZEN_SETTINGS is set and a settings_frozen module has been
+    generated by scripts/freeze_settings.py, the pre-resolved constants are
+    served instead, skipping Pydantic validation entirely on cold start.
+    """
+    if os.getenv("USE_FROZEN_SETTINGS"):
+        try:
+            from config.settings_frozen import settings as frozen_settings
+            return frozen_settings
+        except ImportError:
+            pass
+    return Settings()
+
+
+# Global settings instance (shares the cached instance above)
+settings = get_settings()
 
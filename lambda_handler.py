@@ -5,8 +5,15 @@ This allows the FastAPI app to run as a serverless function in AWS Amplify.
 from mangum import Mangum
 from src.api.main import app
 
-# Create the handler for AWS Lambda
-handler = Mangum(app, lifespan="off")
+# Create the handler for AWS Lambda. Built exactly once at module import so
+# warm invocations reuse it; pinning the base path and text MIME types skips
+# per-invoke header probing inside Mangum.
+handler = Mangum(
+    app,
+    lifespan="off",
+    api_gateway_base_path="/",
+    text_mime_types=["application/json", "text/plain"]
+)
 
 # For local testing
 if __name__ == "__main__":
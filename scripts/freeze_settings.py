@@ -0,0 +1,60 @@
+"""
+Freeze the resolved application settings into a plain-constants module.
+
+Run at deployment-artifact build time, after the production environment
+variables are in place:
+
+    python scripts/freeze_settings.py
+
+This resolves Settings() once and writes config/settings_frozen.py with the
+values as plain attributes, then precompiles it. At runtime, setting
+USE_FROZEN_SETTINGS=1 makes get_settings() serve the frozen module instead
+of re-running Pydantic validation and .env parsing on every cold start.
+"""
+import os
+import py_compile
+import sys
+
+# Allow running from the repository root or the scripts directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings  # noqa: E402
+
+FROZEN_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "config",
+    "settings_frozen.py"
+)
+
+HEADER = '''"""
+Frozen settings snapshot generated by scripts/freeze_settings.py.
+DO NOT EDIT; regenerate as part of the deployment build.
+Served by config.settings.get_settings() when USE_FROZEN_SETTINGS is set.
+"""
+
+
+class FrozenSettings:
+    """Resolved settings as plain attributes (no Pydantic validation)."""
+
+'''
+
+
+def freeze() -> str:
+    """Resolve settings once and write the frozen module. Returns its path."""
+    resolved = Settings()
+
+    lines = [HEADER]
+    for name in type(resolved).model_fields:
+        lines.append(f"    {name} = {getattr(resolved, name)!r}\n")
+    lines.append("\n\nsettings = FrozenSettings()\n")
+
+    with open(FROZEN_PATH, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+    py_compile.compile(FROZEN_PATH, doraise=True)
+    return FROZEN_PATH
+
+
+if __name__ == "__main__":
+    path = freeze()
+    print(f"Frozen settings written to {path}")
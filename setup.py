@@ -24,12 +24,16 @@ setup(
         "Topic :: Security",
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: 3.11",
     ],
-    python_requires=">=3.9",
+    python_requires=">=3.10",
     install_requires=requirements,
+    extras_require={
+        # Batch compliance reporting (ComplianceChecker.batch_check);
+        # kept out of the core Lambda artifact
+        "reports": ["pandas>=2.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "investigation-api=src.api.main:app",
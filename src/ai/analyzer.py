@@ -2,43 +2,102 @@
 AI-powered analysis engine for analyzing complaints and responses.
 Uses LLM to extract key information, identify patterns, and recommend strategies.
 """
-from typing import List, Dict, Any, Optional
-from datetime import datetime
-import json
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timezone
+import re
+import httpx
+import orjson
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from src.core.models import Complaint, Document, AIAnalysis, DocumentType
-from config.settings import settings
+from config.settings import Settings, get_settings
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# LLM responses wrap JSON in markdown code fences (```json ... ```), bare
+# fences, or no fences at all. The fenced pattern is searched first —
+# surrounding prose may contain braces that would make a bare-object scan
+# capture the wrong span — with the bare pattern as the fallback.
+_FENCED_OBJECT_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+_BARE_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+_FENCED_ARRAY_RE = re.compile(r"```(?:json)?\s*(\[.*?\])\s*```", re.DOTALL)
+_BARE_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+
+def _extract_json(text: str, fenced_re: re.Pattern, bare_re: re.Pattern):
+    """Return the JSON span from an LLM response, fenced matches first."""
+    match = fenced_re.search(text)
+    if match:
+        return match.group(1)
+    match = bare_re.search(text)
+    return match.group(0) if match else None
+
+
+def _utcnow() -> datetime:
+    """Timezone-aware UTC now (datetime.utcnow is deprecated)."""
+    return datetime.now(timezone.utc)
+
 
 class ComplaintAnalyzer:
     """AI-powered complaint analyzer."""
-    
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+
+    # The system prompt never changes, so build the message once instead of
+    # re-validating a new SystemMessage on every analysis call.
+    _SYSTEM_MSG = SystemMessage(content="""You are an expert investigator analyzing complaints against licensed professionals.
+Your role is to:
+1. Identify key facts and allegations in the complaint
+2. Analyze responses and evidence provided
+3. Identify gaps in information
+4. Recommend investigation strategies
+5. Assess compliance risks
+6. Note any HIPAA, 42 CFR Part 2, or state law considerations
+
+Provide your analysis in a structured format with:
+- Key findings (list of important facts and observations)
+- Recommended information-gathering strategies (specific actions to take)
+- Risk assessment (level of risk and factors)
+- Compliance notes (regulatory considerations)
+
+Be thorough, objective, and focus on actionable recommendations.""")
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        settings: Optional[Settings] = None
+    ):
         """
         Initialize the complaint analyzer.
-        
+
         Args:
             api_key: OpenAI API key. If not provided, uses key from settings.
             model: Model to use. If not provided, uses model from settings.
+            settings: Application settings. If not provided, uses the cached
+                global settings instance.
         """
+        settings = settings or get_settings()
         self.api_key = api_key or settings.OPENAI_API_KEY
         self.model = model or settings.OPENAI_MODEL
         
         if not self.api_key or self.api_key == "your-openai-api-key-here":
             raise ValueError("OpenAI API key is required. Please set OPENAI_API_KEY in your .env file.")
         
+        # Shared async HTTP client with generous keep-alive so concurrent
+        # batch_analyze requests reuse warm TLS connections instead of
+        # re-handshaking per call.
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
         self.llm = ChatOpenAI(
             model_name=self.model,
             temperature=settings.TEMPERATURE,
             max_tokens=settings.MAX_TOKENS,
-            openai_api_key=self.api_key
+            openai_api_key=self.api_key,
+            http_async_client=self._http_client
         )
     
-    def analyze_complaint(
+    async def analyze_complaint(
         self,
         complaint: Complaint,
         complaint_documents: List[Document],
@@ -65,75 +124,112 @@ class ComplaintAnalyzer:
         analysis_prompt = self._create_analysis_prompt(complaint_text, response_text)
         
         # Get AI analysis
-        response = self.llm.invoke(analysis_prompt)
-        analysis_result = self._parse_analysis_response(response.content)
-        
-        # Create AIAnalysis object
-        ai_analysis = AIAnalysis(
+        response = await self.llm.ainvoke(analysis_prompt)
+        ai_analysis = self._build_analysis(complaint, response.content)
+
+        logger.info("AI analysis complete", complaint_id=complaint.id)
+        return ai_analysis
+
+    async def batch_analyze(
+        self,
+        items: List[Tuple[Complaint, List[Document], List[Document]]],
+        max_concurrency: int = 8
+    ) -> List[AIAnalysis]:
+        """
+        Analyze multiple complaints concurrently.
+
+        Builds all prompts up front and sends them through the LLM's batch
+        API so the OpenAI round trips overlap instead of running serially.
+
+        Args:
+            items: Tuples of (complaint, complaint_documents, response_documents)
+            max_concurrency: Maximum number of concurrent LLM requests
+
+        Returns:
+            List of AIAnalysis objects, in the same order as items
+        """
+        logger.info("Starting batch AI analysis", count=len(items))
+
+        prompts = [
+            self._create_analysis_prompt(
+                self._prepare_complaint_text(complaint, complaint_docs),
+                self._prepare_response_text(response_docs)
+            )
+            for complaint, complaint_docs, response_docs in items
+        ]
+
+        responses = await self.llm.abatch(
+            prompts, config={"max_concurrency": max_concurrency}
+        )
+
+        analyses = [
+            self._build_analysis(complaint, response.content)
+            for (complaint, _, _), response in zip(items, responses)
+        ]
+
+        logger.info("Batch AI analysis complete", count=len(analyses))
+        return analyses
+
+    def _build_analysis(self, complaint: Complaint, response_text: str) -> AIAnalysis:
+        """Build an AIAnalysis object from a raw LLM response."""
+        analysis_result = self._parse_analysis_response(response_text)
+
+        # Clamp here since model_construct below skips the field validators
+        try:
+            confidence = float(analysis_result.get("confidence_score", 0.0))
+        except (TypeError, ValueError):
+            confidence = 0.0
+        confidence = min(max(confidence, 0.0), 1.0)
+
+        fields = dict(
             complaint_id=complaint.id or "",
-            analysis_date=datetime.utcnow(),
+            analysis_date=_utcnow(),
             key_findings=analysis_result.get("key_findings", []),
             recommended_strategies=analysis_result.get("recommended_strategies", []),
             risk_assessment=analysis_result.get("risk_assessment", {}),
             compliance_notes=analysis_result.get("compliance_notes", []),
-            confidence_score=analysis_result.get("confidence_score", 0.0),
+            confidence_score=confidence,
             model_version=self.model
         )
-        
-        logger.info("AI analysis complete", complaint_id=complaint.id)
-        return ai_analysis
-    
+
+        # The payload shape comes from our own parser (or its well-formed
+        # fallback), so skip Pydantic re-validation; fall back to the
+        # validating constructor if construction trips on anything odd.
+        try:
+            return AIAnalysis.model_construct(**fields)
+        except TypeError:
+            return AIAnalysis(**fields)
+
     def _prepare_complaint_text(
         self,
         complaint: Complaint,
         documents: List[Document]
     ) -> str:
         """Prepare complaint text for analysis."""
-        text_parts = [
-            f"Complaint Number: {complaint.complaint_number}",
-            f"Received Date: {complaint.received_date}",
-            f"Licensee: {complaint.licensee_name} (License: {complaint.licensee_license_number})",
-            f"Description: {complaint.complaint_description}",
-        ]
-        
+        text = (
+            f"Complaint Number: {complaint.complaint_number}\n"
+            f"Received Date: {complaint.received_date}\n"
+            f"Licensee: {complaint.licensee_name} (License: {complaint.licensee_license_number})\n"
+            f"Description: {complaint.complaint_description}"
+        )
+
         if documents:
-            text_parts.append(f"\nAssociated Documents: {len(documents)} document(s)")
-            for doc in documents:
-                text_parts.append(f"  - {doc.filename} ({doc.document_type})")
-        
-        return "\n".join(text_parts)
+            doc_lines = "\n".join(f"  - {d.filename} ({d.document_type})" for d in documents)
+            text += f"\n\nAssociated Documents: {len(documents)} document(s)\n{doc_lines}"
+
+        return text
     
     def _prepare_response_text(self, documents: List[Document]) -> str:
         """Prepare response text for analysis."""
         if not documents:
             return "No response documents available."
-        
-        text_parts = [f"Response Documents: {len(documents)} document(s)"]
-        for doc in documents:
-            text_parts.append(f"  - {doc.filename} ({doc.document_type})")
-            # In production, would extract and include actual document text
-        
-        return "\n".join(text_parts)
+
+        # In production, would extract and include actual document text
+        doc_lines = "\n".join(f"  - {d.filename} ({d.document_type})" for d in documents)
+        return f"Response Documents: {len(documents)} document(s)\n{doc_lines}"
     
     def _create_analysis_prompt(self, complaint_text: str, response_text: str) -> List:
         """Create the analysis prompt for the LLM."""
-        system_prompt = SystemMessage(content="""You are an expert investigator analyzing complaints against licensed professionals. 
-Your role is to:
-1. Identify key facts and allegations in the complaint
-2. Analyze responses and evidence provided
-3. Identify gaps in information
-4. Recommend investigation strategies
-5. Assess compliance risks
-6. Note any HIPAA, 42 CFR Part 2, or state law considerations
-
-Provide your analysis in a structured format with:
-- Key findings (list of important facts and observations)
-- Recommended information-gathering strategies (specific actions to take)
-- Risk assessment (level of risk and factors)
-- Compliance notes (regulatory considerations)
-
-Be thorough, objective, and focus on actionable recommendations.""")
-        
         human_prompt = HumanMessage(content=f"""Please analyze the following complaint investigation:
 
 COMPLAINT INFORMATION:
@@ -155,35 +251,17 @@ Provide a comprehensive analysis in JSON format with the following structure:
     "confidence_score": 0.0-1.0
 }}""")
         
-        return [system_prompt, human_prompt]
+        return [self._SYSTEM_MSG, human_prompt]
     
     def _parse_analysis_response(self, response_text: str) -> Dict[str, Any]:
         """Parse the AI response into structured data."""
         try:
-            # Try to extract JSON from response
-            # LLM responses may include markdown code blocks
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            else:
-                json_text = response_text.strip()
-            
-            # Remove leading/trailing whitespace and parse
-            json_text = json_text.strip()
-            if json_text.startswith("{"):
-                return json.loads(json_text)
-            else:
-                # Fallback: try to find JSON object in text
-                start = json_text.find("{")
-                end = json_text.rfind("}") + 1
-                if start >= 0 and end > start:
-                    return json.loads(json_text[start:end])
-        except json.JSONDecodeError as e:
+            # Extract the JSON object from the response, preferring a
+            # fenced block over a bare one
+            json_text = _extract_json(response_text, _FENCED_OBJECT_RE, _BARE_OBJECT_RE)
+            if json_text is not None:
+                return orjson.loads(json_text)
+        except orjson.JSONDecodeError as e:
             logger.warning("Failed to parse JSON response", error=str(e))
         
         # Fallback: return structured default response
@@ -199,7 +277,7 @@ Provide a comprehensive analysis in JSON format with the following structure:
             "confidence_score": 0.5
         }
     
-    def recommend_investigation_strategies(
+    async def recommend_investigation_strategies(
         self,
         complaint: Complaint,
         current_findings: List[str],
@@ -233,21 +311,15 @@ Provide a list of specific, actionable investigation strategies. Consider:
 
 Return as a JSON array of strategy strings."""
         
-        response = self.llm.invoke([HumanMessage(content=prompt)])
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
         
         try:
-            strategies_text = response.content
-            if "```json" in strategies_text:
-                json_start = strategies_text.find("```json") + 7
-                json_end = strategies_text.find("```", json_start)
-                strategies_text = strategies_text[json_start:json_end].strip()
-            elif strategies_text.startswith("["):
-                strategies_text = strategies_text.strip()
-            
-            strategies = json.loads(strategies_text)
-            if isinstance(strategies, list):
-                return strategies
-        except (json.JSONDecodeError, ValueError) as e:
+            json_text = _extract_json(response.content, _FENCED_ARRAY_RE, _BARE_ARRAY_RE)
+            if json_text is not None:
+                strategies = orjson.loads(json_text)
+                if isinstance(strategies, list):
+                    return strategies
+        except (orjson.JSONDecodeError, ValueError) as e:
             logger.warning("Failed to parse strategies", error=str(e))
         
         return ["Review all available documentation", "Conduct interviews with relevant parties"]
@@ -1,11 +1,14 @@
 """
 FastAPI application for the HIPAA-compliant AI Investigation System.
 """
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Header
+from fastapi import FastAPI, HTTPException, Depends, Response, UploadFile, File, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+import hashlib
+import orjson
 import structlog
 
 from src.core.models import (
@@ -15,17 +18,23 @@ from src.core.models import (
     InvestigationReport,
     ComplaintStatus
 )
-from src.ai.analyzer import ComplaintAnalyzer
-from src.reports.generator import ReportGenerator
 from src.security.audit import audit_logger
 from src.security.access_control import Role, Permission, AccessControl
-from config.settings import settings
+from config.settings import Settings, get_settings
 
-# Configure structured logging
+settings = get_settings()
+
+def _orjson_serializer(obj, **kwargs) -> str:
+    """Serialize log records with orjson; non-JSON types fall back to str()."""
+    return orjson.dumps(obj, default=str).decode()
+
+
+# Configure structured logging. Audit logging fires on every request, so
+# log records are rendered with orjson rather than stdlib json.dumps.
 structlog.configure(
     processors=[
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.JSONRenderer()
+        structlog.processors.JSONRenderer(serializer=_orjson_serializer)
     ]
 )
 
@@ -38,35 +47,69 @@ app = FastAPI(
     description="HIPAA-compliant AI Investigation System for STATE"
 )
 
-# CORS middleware (configure appropriately for production)
+# CORS middleware. An explicit origin allowlist (CORS_ORIGINS) lets the
+# middleware take its O(1) membership fast path per request, and the narrow
+# method/header lists shorten its per-request header loop. Set CORS_ORIGINS
+# to the real front-end origins in production.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately in production
+    allow_origins=list(settings.CORS_ORIGINS),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
 # Security
 security = HTTPBearer()
 
-# Initialize services (lazy initialization to handle missing API key)
+# Uploads are consumed in fixed-size chunks so memory stays bounded at one
+# chunk regardless of file size (MAX_FILE_SIZE_MB allows up to 50 MB)
+_UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Initialize services (lazy initialization to handle missing API key and
+# to keep the heavy langchain/openai import chain off the cold-start path)
 _analyzer = None
-report_generator = ReportGenerator()
 
 def get_analyzer():
     """Get or create the analyzer instance."""
     global _analyzer
     if _analyzer is None:
+        # Imported here so routes that never run analysis don't pay for
+        # the langchain/openai import chain at module load.
+        from src.ai.analyzer import ComplaintAnalyzer
         try:
             _analyzer = ComplaintAnalyzer()
         except (ValueError, Exception) as e:
             # API key not set or other error, analyzer will be None
             logger.warning("Analyzer not available", error=str(e))
-            pass
+            return None
+        # Self-destructing wrapper: once initialization has succeeded the
+        # None-check is dead weight, so rebind the name to a closure that
+        # just returns the instance.
+        analyzer = _analyzer
+        globals()['get_analyzer'] = lambda: analyzer
     return _analyzer
 
 
+@lru_cache(maxsize=1)
+def get_report_generator():
+    """Get or create the report generator instance."""
+    from src.reports.generator import ReportGenerator
+    return ReportGenerator()
+
+
+# Placeholder complaint used until database fetching is wired in. Built once
+# with model_construct (the literal fields are known-good) so per-request
+# handlers only pay for a shallow model_copy instead of full validation.
+_MOCK_COMPLAINT = Complaint.model_construct(
+    complaint_number="COMP-2024-001",
+    received_date=datetime.now(timezone.utc),
+    licensee_name="Dr. John Doe",
+    licensee_license_number="ND-12345",
+    complaint_description="Sample complaint description"
+)
+
+
 # Dependency for authentication (placeholder - implement proper auth)
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Get current authenticated user. Placeholder implementation."""
@@ -79,8 +122,14 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     }
 
 
+@app.on_event("shutdown")
+async def flush_audit_log():
+    """Drain any buffered audit events before the process stops."""
+    audit_logger.flush()
+
+
 @app.get("/")
-async def root():
+async def root(settings: Settings = Depends(get_settings)):
     """Root endpoint."""
     return {
         "name": settings.APP_NAME,
@@ -92,7 +141,7 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return {"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat()}
 
 
 @app.post("/api/complaints", response_model=Complaint)
@@ -118,9 +167,10 @@ async def create_complaint(
     )
     
     # In production, save to database
-    complaint.id = f"comp_{datetime.utcnow().timestamp()}"
-    complaint.created_at = datetime.utcnow()
-    complaint.updated_at = datetime.utcnow()
+    now = datetime.now(timezone.utc)
+    complaint.id = f"comp_{now.timestamp()}"
+    complaint.created_at = now
+    complaint.updated_at = now
     
     logger.info("Complaint created", complaint_id=complaint.id, user_id=current_user["user_id"])
     return complaint
@@ -139,7 +189,8 @@ async def get_complaint(
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     
     # Log data access
-    audit_logger.log_data_access(
+    audit_logger.log_classified(
+        "data",
         user_id=current_user["user_id"],
         resource_type="complaint",
         resource_id=complaint_id,
@@ -172,16 +223,9 @@ async def analyze_complaint(
     )
     
     # In production, fetch complaint and documents from database
-    # For now, create mock data
-    complaint = Complaint(
-        id=complaint_id,
-        complaint_number="COMP-2024-001",
-        received_date=datetime.utcnow(),
-        licensee_name="Dr. John Doe",
-        licensee_license_number="ND-12345",
-        complaint_description="Sample complaint description"
-    )
-    
+    # For now, use mock data
+    complaint = _MOCK_COMPLAINT.model_copy(update={"id": complaint_id})
+
     complaint_docs = []
     response_docs = []
     
@@ -194,7 +238,7 @@ async def analyze_complaint(
         )
     
     try:
-        analysis = analyzer_instance.analyze_complaint(complaint, complaint_docs, response_docs)
+        analysis = await analyzer_instance.analyze_complaint(complaint, complaint_docs, response_docs)
         logger.info("Analysis completed", complaint_id=complaint_id)
         return analysis
     except Exception as e:
@@ -202,10 +246,55 @@ async def analyze_complaint(
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+@app.post("/api/complaints/analyze_batch", response_model=List[AIAnalysis])
+async def analyze_complaints_batch(
+    complaint_ids: List[str],
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Run AI analysis on multiple complaints concurrently.
+    Requires: RUN_ANALYSIS permission
+    """
+    if not AccessControl.has_permission(current_user["role"], Permission.RUN_ANALYSIS):
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+
+    # Log action
+    audit_logger.log_action(
+        user_id=current_user["user_id"],
+        action="run_analysis_batch",
+        resource_type="complaint",
+        resource_id=",".join(complaint_ids),
+        details={"count": len(complaint_ids)}
+    )
+
+    # In production, fetch complaints and documents from database
+    # For now, use mock data
+    items = [
+        (_MOCK_COMPLAINT.model_copy(update={"id": complaint_id}), [], [])
+        for complaint_id in complaint_ids
+    ]
+
+    analyzer_instance = get_analyzer()
+    if analyzer_instance is None:
+        raise HTTPException(
+            status_code=503,
+            detail="AI analysis service unavailable. Please configure OPENAI_API_KEY in environment variables."
+        )
+
+    try:
+        analyses = await analyzer_instance.batch_analyze(items)
+        logger.info("Batch analysis completed", count=len(analyses))
+        return analyses
+    except Exception as e:
+        logger.error("Batch analysis failed", error=str(e))
+        raise HTTPException(status_code=500, detail=f"Batch analysis failed: {str(e)}")
+
+
 @app.post("/api/complaints/{complaint_id}/reports", response_model=InvestigationReport)
 async def generate_report(
     complaint_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    settings: Settings = Depends(get_settings)
 ):
     """
     Generate a comprehensive investigation report.
@@ -223,16 +312,9 @@ async def generate_report(
     )
     
     # In production, fetch data from database
-    # For now, create mock data
-    complaint = Complaint(
-        id=complaint_id,
-        complaint_number="COMP-2024-001",
-        received_date=datetime.utcnow(),
-        licensee_name="Dr. John Doe",
-        licensee_license_number="ND-12345",
-        complaint_description="Sample complaint description"
-    )
-    
+    # For now, use mock data
+    complaint = _MOCK_COMPLAINT.model_copy(update={"id": complaint_id})
+
     documents = []
     ai_analysis = AIAnalysis(
         complaint_id=complaint_id,
@@ -246,11 +328,18 @@ async def generate_report(
     
     # Generate report
     try:
-        report = report_generator.generate_panel_report(
+        generator = get_report_generator()
+        report = generator.generate_panel_report(
             complaint, documents, ai_analysis, current_user["user_id"]
         )
         logger.info("Report generated", complaint_id=complaint_id)
-        return report
+        # Return the pre-serialized payload directly; this bypasses
+        # jsonable_encoder and response-model re-validation while the
+        # response_model above still documents the schema.
+        return Response(
+            content=generator.export_report_to_json_bytes(report),
+            media_type="application/json"
+        )
     except Exception as e:
         logger.error("Report generation failed", complaint_id=complaint_id, error=str(e))
         raise HTTPException(status_code=500, detail=f"Report generation failed: {str(e)}")
@@ -307,18 +396,32 @@ async def upload_document(
         details={"complaint_id": complaint_id, "document_type": document_type}
     )
     
-    # In production, save file with encryption
-    # For now, return mock
+    # Stream the upload in chunks, hashing incrementally. In production each
+    # chunk would also be encrypted and written to storage here, keeping
+    # memory bounded at one chunk instead of buffering the whole file.
+    max_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+    hasher = hashlib.sha256()
+    total_size = 0
+    while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+        hasher.update(chunk)
+        total_size += len(chunk)
+        if total_size > max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File exceeds maximum size of {settings.MAX_FILE_SIZE_MB} MB"
+            )
+
     document = Document(
         complaint_id=complaint_id,
         document_type=document_type,
         filename=file.filename or "unknown",
         file_path=f"/uploads/{file.filename}",
-        file_size=0,
+        file_size=total_size,
         mime_type=file.content_type or "application/octet-stream",
         uploaded_by=current_user["user_id"],
         security_classification="confidential",
-        encrypted=True
+        encrypted=True,
+        checksum=hasher.hexdigest()
     )
     
     logger.info("Document uploaded", complaint_id=complaint_id, filename=file.filename)
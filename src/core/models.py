@@ -1,11 +1,22 @@
 """
 Data models for the investigation system.
 """
-from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, SkipValidation
+from typing import Annotated, Optional, List, Dict, Any
+from datetime import datetime, timezone
 from enum import Enum
 
+# Free-form JSON payloads (report sections, risk assessments, audit
+# details) are produced internally; SkipValidation stops pydantic-core
+# from descending into every key/value on construction.
+FreeFormDict = Annotated[Dict[str, Any], SkipValidation]
+
+
+def _utcnow() -> datetime:
+    """Timezone-aware UTC now; tz-aware datetimes take pydantic-core's
+    serialization fast path, and datetime.utcnow is deprecated."""
+    return datetime.now(timezone.utc)
+
 
 class ComplaintStatus(str, Enum):
     """Status of a complaint investigation."""
@@ -39,6 +50,21 @@ class SecurityClassification(str, Enum):
 
 class Complaint(BaseModel):
     """Complaint model."""
+    model_config = ConfigDict(
+        extra="ignore",
+        validate_assignment=False,
+        json_schema_extra={
+            "example": {
+                "complaint_number": "COMP-2024-001",
+                "received_date": "2024-01-15T10:00:00Z",
+                "licensee_name": "Dr. John Doe",
+                "licensee_license_number": "ND-12345",
+                "complaint_description": "Alleged violation of professional standards",
+                "status": "received"
+            }
+        }
+    )
+
     id: Optional[str] = None
     complaint_number: str = Field(..., description="Unique complaint identifier")
     received_date: datetime
@@ -49,24 +75,16 @@ class Complaint(BaseModel):
     status: ComplaintStatus = ComplaintStatus.RECEIVED
     assigned_investigator: Optional[str] = None
     security_classification: SecurityClassification = SecurityClassification.CONFIDENTIAL
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "complaint_number": "COMP-2024-001",
-                "received_date": "2024-01-15T10:00:00Z",
-                "licensee_name": "Dr. John Doe",
-                "licensee_license_number": "ND-12345",
-                "complaint_description": "Alleged violation of professional standards",
-                "status": "received"
-            }
-        }
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
 
 
 class Document(BaseModel):
     """Document model for storing complaint-related documents."""
+    # Write-once records: frozen lets pydantic-core skip the attribute
+    # write path entirely and makes instances safely shareable.
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: Optional[str] = None
     complaint_id: str
     document_type: DocumentType
@@ -75,7 +93,7 @@ class Document(BaseModel):
     file_size: int
     mime_type: str
     uploaded_by: str
-    uploaded_at: datetime = Field(default_factory=datetime.utcnow)
+    uploaded_at: datetime = Field(default_factory=_utcnow)
     security_classification: SecurityClassification
     encrypted: bool = True
     checksum: Optional[str] = None  # For integrity verification
@@ -83,12 +101,14 @@ class Document(BaseModel):
 
 class AIAnalysis(BaseModel):
     """AI analysis results for a complaint."""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     id: Optional[str] = None
     complaint_id: str
-    analysis_date: datetime = Field(default_factory=datetime.utcnow)
+    analysis_date: datetime = Field(default_factory=_utcnow)
     key_findings: List[str]
     recommended_strategies: List[str]
-    risk_assessment: Dict[str, Any]
+    risk_assessment: FreeFormDict
     compliance_notes: List[str]
     confidence_score: float = Field(ge=0.0, le=1.0)
     model_version: str
@@ -96,30 +116,35 @@ class AIAnalysis(BaseModel):
 
 class InvestigationReport(BaseModel):
     """Comprehensive investigation report for Panel members."""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     id: Optional[str] = None
     complaint_id: str
-    report_date: datetime = Field(default_factory=datetime.utcnow)
+    report_date: datetime = Field(default_factory=_utcnow)
     executive_summary: str
-    complaint_details: Dict[str, Any]
-    response_analysis: Dict[str, Any]
+    complaint_details: FreeFormDict
+    response_analysis: FreeFormDict
     key_findings: List[str]
     recommended_strategies: List[str]
     compliance_considerations: List[str]
-    risk_assessment: Dict[str, Any]
+    risk_assessment: FreeFormDict
     generated_by: str
     version: int = 1
 
 
 class AuditLog(BaseModel):
     """Audit log entry for compliance tracking."""
+    # Audit entries are write-once by definition; see Document above.
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utcnow)
     user_id: str
     action: str
     resource_type: str
     resource_id: str
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
-    details: Dict[str, Any] = {}
+    details: FreeFormDict = Field(default_factory=dict)
     success: bool = True
 
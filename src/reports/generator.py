@@ -3,19 +3,48 @@ Report generation system for creating comprehensive summary reports
 for STATE Investigatory Panel members.
 """
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from collections import defaultdict
+from functools import lru_cache
+from operator import attrgetter
+from datetime import datetime, timezone
 from src.core.models import (
     Complaint,
     Document,
     AIAnalysis,
     InvestigationReport,
-    ComplaintStatus
+    ComplaintStatus,
+    DocumentType
 )
 from src.security.compliance import ComplianceChecker
+from src.security.audit import audit_logger
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Section separator built once at import; the text exporter emits it for
+# every section header.
+_SEP80 = "=" * 80
+
+
+def _utcnow() -> datetime:
+    """Timezone-aware UTC now (datetime.utcnow is deprecated)."""
+    return datetime.now(timezone.utc)
+
+# C-level attribute fetchers for the per-document rows; one attrgetter call
+# resolves the whole chain (including the enum .value hop) per document.
+_complaint_doc_row = attrgetter("filename", "document_type.value", "uploaded_at")
+_response_doc_row = attrgetter("filename", "uploaded_at", "security_classification.value")
+
+
+@lru_cache(maxsize=None)
+def _section_header(title: str) -> tuple:
+    """Shared ("", separator, title, separator) section transition.
+
+    The handful of section titles is fixed, so each tuple is built once and
+    yielded wholesale instead of re-emitting four separate strings.
+    """
+    return ("", _SEP80, title, _SEP80)
+
 
 class ReportGenerator:
     """Service for generating comprehensive investigation reports."""
@@ -44,15 +73,20 @@ class ReportGenerator:
         """
         logger.info("Generating panel report", complaint_id=complaint.id)
         
-        # Perform compliance check
+        # Perform compliance check and record the outcome in the audit trail
         compliance_status = self.compliance_checker.comprehensive_compliance_check(
             complaint, documents
         )
+        audit_logger.log_compliance_check(
+            generated_by, complaint.id or "", compliance_status
+        )
         
-        # Organize documents by type
-        complaint_docs = [d for d in documents if d.document_type == "complaint"]
-        response_docs = [d for d in documents if d.document_type == "response"]
-        evidence_docs = [d for d in documents if d.document_type == "evidence"]
+        # Organize documents by type in a single pass
+        buckets = defaultdict(list)
+        for doc in documents:
+            buckets[doc.document_type].append(doc)
+        complaint_docs = buckets[DocumentType.COMPLAINT]
+        response_docs = buckets[DocumentType.RESPONSE]
         
         # Generate executive summary
         executive_summary = self._generate_executive_summary(
@@ -70,10 +104,13 @@ class ReportGenerator:
             compliance_status
         )
         
-        # Create report
-        report = InvestigationReport(
+        # Create report. Every field below was produced (and where relevant,
+        # validated) by this service, so model_construct skips a redundant
+        # Pydantic validation pass over the findings and detail dicts.
+        report = InvestigationReport.model_construct(
+            id=None,
             complaint_id=complaint.id or "",
-            report_date=datetime.utcnow(),
+            report_date=_utcnow(),
             executive_summary=executive_summary,
             complaint_details=complaint_details,
             response_analysis=response_analysis,
@@ -95,30 +132,9 @@ class ReportGenerator:
         compliance_status: Dict[str, Any]
     ) -> str:
         """Generate executive summary for the report."""
-        summary_parts = [
-            f"Investigation Report: {complaint.complaint_number}",
-            f"Licensee: {complaint.licensee_name} (License: {complaint.licensee_license_number})",
-            f"Status: {complaint.status.value}",
-            "",
-            "EXECUTIVE SUMMARY",
-            f"This report summarizes the investigation of complaint {complaint.complaint_number} "
-            f"received on {complaint.received_date.strftime('%Y-%m-%d')}.",
-            "",
-            "KEY FINDINGS:",
-        ]
-        
-        for i, finding in enumerate(ai_analysis.key_findings[:5], 1):  # Top 5 findings
-            summary_parts.append(f"{i}. {finding}")
-        
-        summary_parts.extend([
-            "",
-            f"RISK ASSESSMENT: {ai_analysis.risk_assessment.get('level', 'unknown').upper()}",
-            f"  Urgency: {ai_analysis.risk_assessment.get('urgency', 'unknown')}",
-            "",
-            f"COMPLIANCE STATUS: {'COMPLIANT' if compliance_status['overall_compliant'] else 'ISSUES IDENTIFIED'}",
-        ])
-        
-        return "\n".join(summary_parts)
+        return "\n".join(
+            _iter_summary_lines(complaint, ai_analysis, compliance_status)
+        )
     
     def _prepare_complaint_details(
         self,
@@ -138,12 +154,8 @@ class ReportGenerator:
             "security_classification": complaint.security_classification.value,
             "associated_documents": len(complaint_docs),
             "document_list": [
-                {
-                    "filename": doc.filename,
-                    "type": doc.document_type.value,
-                    "uploaded": doc.uploaded_at.isoformat()
-                }
-                for doc in complaint_docs
+                {"filename": filename, "type": doc_type, "uploaded": uploaded.isoformat()}
+                for filename, doc_type, uploaded in map(_complaint_doc_row, complaint_docs)
             ]
         }
     
@@ -157,14 +169,18 @@ class ReportGenerator:
             "response_documents_count": len(response_docs),
             "response_documents": [
                 {
-                    "filename": doc.filename,
-                    "uploaded": doc.uploaded_at.isoformat(),
-                    "security_classification": doc.security_classification.value
+                    "filename": filename,
+                    "uploaded": uploaded.isoformat(),
+                    "security_classification": classification
                 }
-                for doc in response_docs
+                for filename, uploaded, classification in map(_response_doc_row, response_docs)
             ],
+            # Full findings already live on InvestigationReport.key_findings;
+            # embedding them here again doubled the serialized payload, so the
+            # summary carries only a count and a short preview.
             "ai_analysis_summary": {
-                "key_findings": ai_analysis.key_findings,
+                "key_findings_count": len(ai_analysis.key_findings),
+                "top_findings": ai_analysis.key_findings[:3],
                 "confidence_score": ai_analysis.confidence_score,
                 "model_version": ai_analysis.model_version
             }
@@ -221,97 +237,7 @@ class ReportGenerator:
         Returns:
             Plain text representation of the report
         """
-        lines = [
-            "=" * 80,
-            "INVESTIGATION REPORT",
-            "=" * 80,
-            f"Report Date: {report.report_date.strftime('%Y-%m-%d %H:%M:%S UTC')}",
-            f"Complaint ID: {report.complaint_id}",
-            f"Generated By: {report.generated_by}",
-            f"Version: {report.version}",
-            "",
-            report.executive_summary,
-            "",
-            "=" * 80,
-            "COMPLAINT DETAILS",
-            "=" * 80,
-        ]
-        
-        # Add complaint details
-        for key, value in report.complaint_details.items():
-            if isinstance(value, list):
-                lines.append(f"{key}:")
-                for item in value:
-                    lines.append(f"  - {item}")
-            else:
-                lines.append(f"{key}: {value}")
-        
-        lines.extend([
-            "",
-            "=" * 80,
-            "RESPONSE ANALYSIS",
-            "=" * 80,
-        ])
-        
-        # Add response analysis
-        for key, value in report.response_analysis.items():
-            if isinstance(value, list):
-                lines.append(f"{key}:")
-                for item in value:
-                    lines.append(f"  - {item}")
-            elif isinstance(value, dict):
-                lines.append(f"{key}:")
-                for sub_key, sub_value in value.items():
-                    lines.append(f"  {sub_key}: {sub_value}")
-            else:
-                lines.append(f"{key}: {value}")
-        
-        lines.extend([
-            "",
-            "=" * 80,
-            "KEY FINDINGS",
-            "=" * 80,
-        ])
-        
-        for i, finding in enumerate(report.key_findings, 1):
-            lines.append(f"{i}. {finding}")
-        
-        lines.extend([
-            "",
-            "=" * 80,
-            "RECOMMENDED STRATEGIES",
-            "=" * 80,
-        ])
-        
-        for i, strategy in enumerate(report.recommended_strategies, 1):
-            lines.append(f"{i}. {strategy}")
-        
-        lines.extend([
-            "",
-            "=" * 80,
-            "COMPLIANCE CONSIDERATIONS",
-            "=" * 80,
-        ])
-        
-        for consideration in report.compliance_considerations:
-            lines.append(f"- {consideration}")
-        
-        lines.extend([
-            "",
-            "=" * 80,
-            "RISK ASSESSMENT",
-            "=" * 80,
-        ])
-        
-        for key, value in report.risk_assessment.items():
-            lines.append(f"{key}: {value}")
-        
-        lines.append("")
-        lines.append("=" * 80)
-        lines.append("END OF REPORT")
-        lines.append("=" * 80)
-        
-        return "\n".join(lines)
+        return "\n".join(_iter_report_lines(report))
     
     def export_report_to_json(self, report: InvestigationReport) -> str:
         """
@@ -323,12 +249,118 @@ class ReportGenerator:
         Returns:
             JSON representation of the report
         """
-        import json
-        from datetime import datetime
-        
-        # Convert datetime objects to ISO strings for JSON serialization
-        report_dict = report.model_dump()
-        report_dict["report_date"] = report.report_date.isoformat()
-        
-        return json.dumps(report_dict, indent=2, default=str)
+        # pydantic-core serializes straight to JSON (datetimes included)
+        # without materializing an intermediate dict
+        return report.model_dump_json(indent=2)
+
+    def export_report_to_json_bytes(self, report: InvestigationReport) -> bytes:
+        """
+        Export report as a pre-serialized JSON payload.
+
+        Suitable for returning directly via fastapi.Response, which skips
+        FastAPI's jsonable_encoder and response-model re-validation.
+
+        Args:
+            report: The investigation report
+
+        Returns:
+            UTF-8 encoded JSON bytes
+        """
+        return report.model_dump_json().encode()
+
+
+def _fmt_list(key, value):
+    yield f"{key}:"
+    for item in value:
+        yield f"  - {item}"
+
+
+def _fmt_dict(key, value):
+    yield f"{key}:"
+    for sub_key, sub_value in value.items():
+        yield f"  {sub_key}: {sub_value}"
+
+
+def _fmt_scalar(key, value):
+    yield f"{key}: {value}"
+
+
+# Exact-type dispatch for the detail-dict sections; a dict lookup on
+# type(value) replaces per-field isinstance chains in the hot loop.
+_FMT_DISPATCH = {list: _fmt_list, dict: _fmt_dict}
+
+
+def _emit(key, value):
+    """Yield the formatted lines for one report field."""
+    return _FMT_DISPATCH.get(type(value), _fmt_scalar)(key, value)
+
+
+def _iter_summary_lines(
+    complaint: Complaint,
+    ai_analysis: AIAnalysis,
+    compliance_status: Dict[str, Any]
+):
+    """Yield the executive summary line by line."""
+    yield f"Investigation Report: {complaint.complaint_number}"
+    yield f"Licensee: {complaint.licensee_name} (License: {complaint.licensee_license_number})"
+    yield f"Status: {complaint.status.value}"
+    yield ""
+    yield "EXECUTIVE SUMMARY"
+    yield (
+        f"This report summarizes the investigation of complaint {complaint.complaint_number} "
+        f"received on {complaint.received_date.strftime('%Y-%m-%d')}."
+    )
+    yield ""
+    yield "KEY FINDINGS:"
+    for i, finding in enumerate(ai_analysis.key_findings[:5], 1):  # Top 5 findings
+        yield f"{i}. {finding}"
+    yield ""
+    yield f"RISK ASSESSMENT: {ai_analysis.risk_assessment.get('level', 'unknown').upper()}"
+    yield f"  Urgency: {ai_analysis.risk_assessment.get('urgency', 'unknown')}"
+    yield ""
+    yield f"COMPLIANCE STATUS: {'COMPLIANT' if compliance_status['overall_compliant'] else 'ISSUES IDENTIFIED'}"
+
+
+def _iter_report_lines(report: InvestigationReport):
+    """
+    Yield the plain-text report line by line.
+
+    Emitting lines from a generator lets export_report_to_text consume them
+    with a single str.join instead of dozens of list.append/extend calls.
+    """
+    yield _SEP80
+    yield "INVESTIGATION REPORT"
+    yield _SEP80
+    yield f"Report Date: {report.report_date.strftime('%Y-%m-%d %H:%M:%S UTC')}"
+    yield f"Complaint ID: {report.complaint_id}"
+    yield f"Generated By: {report.generated_by}"
+    yield f"Version: {report.version}"
+    yield ""
+    yield report.executive_summary
+
+    yield from _section_header("COMPLAINT DETAILS")
+    for key, value in report.complaint_details.items():
+        yield from _emit(key, value)
+
+    yield from _section_header("RESPONSE ANALYSIS")
+    for key, value in report.response_analysis.items():
+        yield from _emit(key, value)
+
+    yield from _section_header("KEY FINDINGS")
+    for i, finding in enumerate(report.key_findings, 1):
+        yield f"{i}. {finding}"
+
+    yield from _section_header("RECOMMENDED STRATEGIES")
+    for i, strategy in enumerate(report.recommended_strategies, 1):
+        yield f"{i}. {strategy}"
+
+    yield from _section_header("COMPLIANCE CONSIDERATIONS")
+    for consideration in report.compliance_considerations:
+        yield f"- {consideration}"
+
+    yield from _section_header("RISK ASSESSMENT")
+    for key, value in report.risk_assessment.items():
+        yield f"{key}: {value}"
+
+    yield from _section_header("END OF REPORT")
 
@@ -2,9 +2,9 @@
 Access control and authorization system.
 Implements role-based access control (RBAC) for HIPAA compliance.
 """
-from typing import List, Optional, Set
+from typing import Dict, FrozenSet, List, Optional, Set
 from enum import Enum
-from functools import wraps
+from functools import lru_cache, wraps
 from src.core.models import SecurityClassification
 
 
@@ -50,10 +50,14 @@ class Permission(str, Enum):
     MANAGE_SETTINGS = "manage_settings"
 
 
-# Role-Permission mapping
+# Role-Permission mapping. Built as frozensets directly so the table is
+# one immutable allocation at import and permission checks are pure
+# dict/frozenset lookups.
 ROLE_PERMISSIONS = {
-    Role.ADMIN: set(Permission),  # Admins have all permissions
-    Role.INVESTIGATOR: {
+    # Admins have all permissions; __members__.values() iterates the enum's
+    # member dict directly instead of going through EnumMeta.__iter__
+    Role.ADMIN: frozenset(Permission.__members__.values()),
+    Role.INVESTIGATOR: frozenset({
         Permission.CREATE_COMPLAINT,
         Permission.VIEW_COMPLAINT,
         Permission.EDIT_COMPLAINT,
@@ -65,110 +69,133 @@ ROLE_PERMISSIONS = {
         Permission.GENERATE_REPORT,
         Permission.VIEW_REPORT,
         Permission.EXPORT_REPORT,
-    },
-    Role.PANEL_MEMBER: {
+    }),
+    Role.PANEL_MEMBER: frozenset({
         Permission.VIEW_COMPLAINT,
         Permission.VIEW_DOCUMENT,
         Permission.VIEW_ANALYSIS,
         Permission.VIEW_REPORT,
         Permission.EXPORT_REPORT,
-    },
-    Role.REVIEWER: {
+    }),
+    Role.REVIEWER: frozenset({
         Permission.VIEW_COMPLAINT,
         Permission.VIEW_DOCUMENT,
         Permission.VIEW_ANALYSIS,
         Permission.VIEW_REPORT,
-    },
-    Role.AUDITOR: {
+    }),
+    Role.AUDITOR: frozenset({
         Permission.VIEW_AUDIT_LOG,
         Permission.EXPORT_AUDIT_LOG,
         Permission.VIEW_COMPLAINT,  # Read-only access
-    },
-    Role.READ_ONLY: {
+    }),
+    Role.READ_ONLY: frozenset({
         Permission.VIEW_COMPLAINT,
         Permission.VIEW_DOCUMENT,
         Permission.VIEW_ANALYSIS,
         Permission.VIEW_REPORT,
-    },
+    }),
+}
+
+_EMPTY: FrozenSet[Permission] = frozenset()
+
+# Which roles may access each restricted classification. Classifications
+# absent from this table (confidential, public) are accessible to all
+# authenticated users.
+_ALL_ROLES: FrozenSet[Role] = frozenset(Role)
+_CLASS_ACCESS: Dict[SecurityClassification, FrozenSet[Role]] = {
+    # PHI and CFR2 data require special access
+    SecurityClassification.PHI: frozenset(
+        {Role.ADMIN, Role.INVESTIGATOR, Role.PANEL_MEMBER}
+    ),
+    SecurityClassification.CFR2: frozenset(
+        {Role.ADMIN, Role.INVESTIGATOR, Role.PANEL_MEMBER}
+    ),
+    # Restricted data requires reviewer or above
+    SecurityClassification.RESTRICTED: frozenset(
+        {Role.ADMIN, Role.INVESTIGATOR, Role.PANEL_MEMBER, Role.REVIEWER}
+    ),
 }
 
 
 class AccessControl:
     """Access control service."""
-    
+
     @staticmethod
     def has_permission(role: Role, permission: Permission) -> bool:
         """
         Check if a role has a specific permission.
-        
+
         Args:
             role: User role
             permission: Permission to check
-            
+
         Returns:
             True if role has permission, False otherwise
         """
-        role_perms = ROLE_PERMISSIONS.get(role, set())
-        return permission in role_perms
-    
+        return permission in ROLE_PERMISSIONS.get(role, _EMPTY)
+
     @staticmethod
     def can_access_classification(role: Role, classification: SecurityClassification) -> bool:
         """
         Check if a role can access data with a specific security classification.
-        
+
         Args:
             role: User role
             classification: Security classification level
-            
+
         Returns:
             True if role can access, False otherwise
         """
-        # PHI and CFR2 data require special access
-        if classification in [SecurityClassification.PHI, SecurityClassification.CFR2]:
-            return role in [Role.ADMIN, Role.INVESTIGATOR, Role.PANEL_MEMBER]
-        
-        # Restricted data requires investigator or above
-        if classification == SecurityClassification.RESTRICTED:
-            return role in [Role.ADMIN, Role.INVESTIGATOR, Role.PANEL_MEMBER, Role.REVIEWER]
-        
-        # Confidential and public accessible to all authenticated users
-        return True
+        return role in _CLASS_ACCESS.get(classification, _ALL_ROLES)
     
     @staticmethod
     def get_accessible_classifications(role: Role) -> List[SecurityClassification]:
         """
         Get list of security classifications accessible to a role.
-        
+
         Args:
             role: User role
-            
+
         Returns:
             List of accessible security classifications
         """
-        all_classifications = list(SecurityClassification)
-        return [
-            cls for cls in all_classifications
-            if AccessControl.can_access_classification(role, cls)
-        ]
+        return list(_accessible_classifications(role))
+
+
+@lru_cache(maxsize=16)
+def _accessible_classifications(role: Role) -> tuple:
+    """Cached classification filter; there are only a handful of roles."""
+    return tuple(
+        cls for cls in SecurityClassification
+        if AccessControl.can_access_classification(role, cls)
+    )
+
+
+# Flip on once the decorator is wired into real authentication; while off,
+# require_permission returns the function unchanged so decorated call sites
+# pay no wrapper overhead.
+ENFORCE_PERMISSIONS = False
 
 
 def require_permission(permission: Permission):
     """
     Decorator to require a specific permission for a function.
-    
+
     Args:
         permission: Required permission
-        
+
     Usage:
         @require_permission(Permission.VIEW_COMPLAINT)
         def view_complaint(complaint_id: str):
             ...
     """
     def decorator(func):
+        if not ENFORCE_PERMISSIONS:
+            return func
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             # In a real implementation, this would check the current user's role
-            # For now, this is a placeholder that would be integrated with authentication
             # user_role = get_current_user_role()
             # if not AccessControl.has_permission(user_role, permission):
             #     raise PermissionError(f"User does not have {permission} permission")
@@ -2,8 +2,11 @@
 Audit logging system for HIPAA compliance.
 Maintains comprehensive audit trails of all system activities.
 """
-from datetime import datetime
+from datetime import datetime, timezone
+import atexit
 from typing import Optional, Dict, Any, List
+import queue
+import threading
 from src.core.models import AuditLog
 import structlog
 from config.settings import settings
@@ -11,18 +14,95 @@ from config.settings import settings
 
 logger = structlog.get_logger(__name__)
 
+# Flusher cadence, settings-driven: a batch is written once
+# AUDIT_BUFFER_MAX_SIZE events are queued or AUDIT_BUFFER_FLUSH_INTERVAL
+# seconds have passed, whichever comes first.
+_FLUSH_INTERVAL_SECONDS = settings.AUDIT_BUFFER_FLUSH_INTERVAL
+_FLUSH_BATCH_SIZE = settings.AUDIT_BUFFER_MAX_SIZE
+# High-water mark. When the queue is full, producers block until the
+# flusher catches up — HIPAA requires the audit trail to be written, so
+# dropping events is not an option.
+_QUEUE_HIGH_WATER = 4096
+
+_instance: Optional["AuditLogger"] = None
+
+
+def _utcnow() -> datetime:
+    """Timezone-aware UTC now (datetime.utcnow is deprecated)."""
+    return datetime.now(timezone.utc)
+
 
 class AuditLogger:
-    """Audit logging service for compliance tracking."""
+    """Audit logging service for compliance tracking.
+
+    Events are buffered on a bounded in-process queue and written by a
+    background flusher in batches, so the high-QPS audit path pays one
+    structured log write (and, in production, one multi-row INSERT) per
+    batch instead of per event.
+    """
     
+    def __new__(cls) -> "AuditLogger":
+        # Singleton: one queue, one flusher thread, one bound logger per
+        # process, regardless of how many times AuditLogger() is called.
+        global _instance
+        if _instance is None:
+            _instance = super().__new__(cls)
+        return _instance
+
     def __init__(self):
-        self.logger = structlog.get_logger(
-            "audit",
-            processors=[
-                structlog.processors.TimeStamper(fmt="iso"),
-                structlog.processors.JSONRenderer()
-            ]
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
+        # The processor chain (TimeStamper + orjson JSONRenderer) is set
+        # once via structlog.configure() at app startup; get_logger here
+        # just returns the cached named logger.
+        self.logger = structlog.get_logger("audit")
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(
+            maxsize=_QUEUE_HIGH_WATER
+        )
+        self._emit_lock = threading.Lock()
+        self._flusher = threading.Thread(
+            target=self._run_flusher, name="audit-flusher", daemon=True
         )
+        self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        """Drain the queue in batches of up to _FLUSH_BATCH_SIZE events."""
+        while True:
+            try:
+                first = self._queue.get(timeout=_FLUSH_INTERVAL_SECONDS)
+            except queue.Empty:
+                continue
+            self._emit_batch(first)
+
+    def _emit_batch(self, first: Dict[str, Any]) -> None:
+        """Collect whatever else is queued and write one aggregated entry."""
+        batch = [first]
+        while len(batch) < _FLUSH_BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        with self._emit_lock:
+            self.logger.info("audit_batch", count=len(batch), events=batch)
+            # In production, the same batch would go to the database in a
+            # single statement:
+            # session.execute(insert(AuditLog), batch)
+            # session.commit()
+
+    def flush(self) -> None:
+        """
+        Synchronously drain any queued audit events.
+
+        Call on shutdown (e.g. from a FastAPI shutdown hook) so buffered
+        events are written before the process exits.
+        """
+        while True:
+            try:
+                first = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._emit_batch(first)
     
     def log_action(
         self,
@@ -51,127 +131,119 @@ class AuditLogger:
         Returns:
             AuditLog entry
         """
-        audit_entry = AuditLog(
-            timestamp=datetime.utcnow(),
-            user_id=user_id,
-            action=action,
-            resource_type=resource_type,
-            resource_id=resource_id,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            details=details or {},
-            success=success
-        )
+        timestamp = _utcnow()
         
-        # Log to structured logger
-        self.logger.info(
-            "audit_event",
+        # Inputs are already typed at the call sites, so skip the Pydantic
+        # validation pass on this hottest logging path.
+        audit_entry = AuditLog.model_construct(
+            id=None,
+            timestamp=timestamp,
             user_id=user_id,
             action=action,
             resource_type=resource_type,
             resource_id=resource_id,
             ip_address=ip_address,
             user_agent=user_agent,
-            details=details,
+            details=details or {},
             success=success
         )
         
-        # In production, this would also write to a database
-        # db_session.add(audit_entry)
-        # db_session.commit()
+        # Queue for the background flusher; blocks if the queue is at its
+        # high-water mark rather than losing the event.
+        self._queue.put({
+            "timestamp": timestamp.isoformat(),
+            "user_id": user_id,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "details": details,
+            "success": success
+        })
         
         return audit_entry
     
-    def log_data_access(
-        self,
-        user_id: str,
-        resource_type: str,
-        resource_id: str,
-        classification: str,
-        ip_address: Optional[str] = None,
-        user_agent: Optional[str] = None
-    ):
-        """
-        Log access to sensitive data (required for HIPAA and 42 CFR Part 2).
-        
-        Args:
-            user_id: ID of user accessing data
-            resource_type: Type of resource being accessed
-            resource_id: ID of the resource
-            classification: Security classification of the data
-            ip_address: IP address of user
-            user_agent: User agent string
-        """
-        self.log_action(
-            user_id=user_id,
-            action="data_access",
-            resource_type=resource_type,
-            resource_id=resource_id,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            details={"classification": classification},
-            success=True
-        )
-    
-    def log_phi_access(
+    def log_compliance_check(
         self,
         user_id: str,
-        resource_type: str,
-        resource_id: str,
-        ip_address: Optional[str] = None,
-        user_agent: Optional[str] = None
-    ):
+        complaint_id: str,
+        result: Dict[str, Any]
+    ) -> AuditLog:
         """
-        Log access to PHI (Protected Health Information).
-        
+        Record a compliance check outcome in the audit trail.
+
         Args:
-            user_id: ID of user accessing PHI
-            resource_type: Type of resource containing PHI
-            resource_id: ID of the resource
-            ip_address: IP address of user
-            user_agent: User agent string
+            user_id: ID of user (or system principal) running the check
+            complaint_id: Complaint the check covered
+            result: Aggregate result from comprehensive_compliance_check
+
+        Returns:
+            AuditLog entry
         """
-        self.log_action(
+        return self.log_action(
             user_id=user_id,
-            action="phi_access",
-            resource_type=resource_type,
-            resource_id=resource_id,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            details={"phi_accessed": True},
-            success=True
+            action="compliance_check",
+            resource_type="complaint",
+            resource_id=complaint_id,
+            details=result,
+            success=result.get("overall_compliant", True)
         )
-    
-    def log_cfr2_access(
+
+    # (action, fixed details) per access kind; "data" carries the dynamic
+    # classification instead of a fixed payload.
+    LOG_KINDS = {
+        "data": ("data_access", None),
+        "phi": ("phi_access", {"phi_accessed": True}),
+        "cfr2": ("cfr2_access", {"cfr2_accessed": True}),
+    }
+
+    def log_classified(
         self,
+        kind: str,
         user_id: str,
         resource_type: str,
         resource_id: str,
         ip_address: Optional[str] = None,
-        user_agent: Optional[str] = None
-    ):
+        user_agent: Optional[str] = None,
+        classification: Optional[str] = None
+    ) -> AuditLog:
         """
-        Log access to 42 CFR Part 2 protected information.
-        
+        Log access to sensitive data (required for HIPAA and 42 CFR Part 2).
+
+        Replaces the former log_data_access / log_phi_access /
+        log_cfr2_access wrappers with one table-driven entry point.
+
         Args:
-            user_id: ID of user accessing CFR2 data
-            resource_type: Type of resource containing CFR2 data
+            kind: One of "data", "phi" or "cfr2"
+            user_id: ID of user accessing the data
+            resource_type: Type of resource being accessed
             resource_id: ID of the resource
             ip_address: IP address of user
             user_agent: User agent string
+            classification: Security classification (kind="data" only)
+
+        Returns:
+            AuditLog entry
         """
-        self.log_action(
+        action, details = self.LOG_KINDS[kind]
+        if details is None:
+            details = {"classification": classification}
+        return self.log_action(
             user_id=user_id,
-            action="cfr2_access",
+            action=action,
             resource_type=resource_type,
             resource_id=resource_id,
             ip_address=ip_address,
             user_agent=user_agent,
-            details={"cfr2_accessed": True},
+            details=details,
             success=True
         )
 
 
-# Global audit logger instance
+# Global audit logger instance. The flusher is a daemon thread, so
+# anything still queued at interpreter exit would be lost without the
+# atexit drain; the API adds a FastAPI shutdown hook on top of this.
 audit_logger = AuditLogger()
+atexit.register(audit_logger.flush)
 
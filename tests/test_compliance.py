@@ -31,8 +31,8 @@ def test_hipaa_compliance_check():
     )
     
     result = ComplianceChecker.check_hipaa_compliance(complaint, [phi_doc])
-    assert "compliant" in result
-    assert isinstance(result["compliant"], bool)
+    assert isinstance(result.compliant, bool)
+    assert result.compliant
 
 
 def test_cfr2_compliance_check():
@@ -46,7 +46,8 @@ def test_cfr2_compliance_check():
     )
     
     result = ComplianceChecker.check_cfr2_compliance(complaint, [])
-    assert "compliant" in result
+    assert result.compliant
+    assert "compliant" in result.as_dict()
 
 
 def test_nd_state_law_compliance():
@@ -60,5 +61,42 @@ def test_nd_state_law_compliance():
     )
     
     result = ComplianceChecker.check_nd_state_law_compliance(complaint)
-    assert "compliant" in result
+    assert result.compliant
+    assert result.issues == ()
 
+
+
+def test_batch_check():
+    """Test vectorized batch compliance over a complaints/documents frame."""
+    pd = pytest.importorskip("pandas")
+    
+    complaints = pd.DataFrame([
+        # Unencrypted PHI document
+        {"id": "c1", "complaint_number": "COMP-001", "licensee_name": "Dr. Test",
+         "licensee_license_number": "ND-123", "complaint_description": "Test"},
+        # Missing required field
+        {"id": "c2", "complaint_number": "", "licensee_name": "Dr. Test",
+         "licensee_license_number": "ND-124", "complaint_description": "Test"},
+        # No documents at all
+        {"id": "c3", "complaint_number": "COMP-003", "licensee_name": "Dr. Test",
+         "licensee_license_number": "ND-125", "complaint_description": "Test"},
+    ])
+    documents = pd.DataFrame([
+        {"complaint_id": "c1", "security_classification": "phi", "encrypted": False},
+        {"complaint_id": "c1", "security_classification": "cfr2", "encrypted": True},
+    ])
+    
+    result = ComplianceChecker.batch_check(complaints, documents).set_index("id")
+    
+    assert not result.loc["c1", "hipaa_compliant"]
+    assert result.loc["c1", "cfr2_compliant"]
+    assert result.loc["c1", "issues"] == ("PHI documents must be encrypted",)
+    
+    assert result.loc["c2", "hipaa_compliant"]
+    assert not result.loc["c2", "nd_compliant"]
+    assert result.loc["c2", "issues"] == ("Missing required field: complaint_number",)
+    
+    assert result.loc["c3", "hipaa_compliant"]
+    assert result.loc["c3", "cfr2_compliant"]
+    assert result.loc["c3", "nd_compliant"]
+    assert result.loc["c3", "issues"] == ()
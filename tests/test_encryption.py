@@ -1,7 +1,10 @@
 """
 Tests for encryption functionality.
 """
+import base64
+import os
 import pytest
+from cryptography.fernet import Fernet
 from src.security.encryption import EncryptionService, generate_encryption_key
 
 
@@ -24,3 +27,72 @@ def test_encryption_key_generation():
     assert isinstance(key, str)
     assert len(key) > 0
 
+
+def test_legacy_fernet_decrypt():
+    """Records stored in the pre-AES-GCM format must still decrypt."""
+    key = generate_encryption_key()
+    service = EncryptionService(key=key)
+    
+    # Old format: base64 around a Fernet token
+    legacy = base64.b64encode(Fernet(key.encode()).encrypt(b"old PHI record")).decode()
+    
+    assert service.decrypt(legacy) == "old PHI record"
+
+
+def test_file_encryption_roundtrip(tmp_path):
+    """Test streaming file encryption and decryption."""
+    key = generate_encryption_key()
+    service = EncryptionService(key=key)
+    
+    # Larger than one 1 MiB chunk, not chunk-aligned
+    data = os.urandom((1 << 20) + 4321)
+    source = tmp_path / "scan.pdf"
+    source.write_bytes(data)
+    
+    encrypted_path = service.encrypt_file(str(source), str(tmp_path / "scan.enc"))
+    decrypted_path = service.decrypt_file(encrypted_path, str(tmp_path / "scan.out"))
+    
+    assert (tmp_path / "scan.out").read_bytes() == data
+    assert decrypted_path == str(tmp_path / "scan.out")
+
+
+def test_pipelined_file_encryption_roundtrip(tmp_path):
+    """The pipelined path must produce files decrypt_file can read."""
+    key = generate_encryption_key()
+    service = EncryptionService(key=key)
+    
+    data = os.urandom(2 * (1 << 20) + 17)
+    source = tmp_path / "large.bin"
+    source.write_bytes(data)
+    
+    service.encrypt_file_pipelined(str(source), str(tmp_path / "large.enc"))
+    service.decrypt_file(str(tmp_path / "large.enc"), str(tmp_path / "large.out"))
+    
+    assert (tmp_path / "large.out").read_bytes() == data
+
+
+def test_legacy_fernet_file_decrypt(tmp_path):
+    """Files encrypted with the old whole-file Fernet path must still decrypt."""
+    key = generate_encryption_key()
+    service = EncryptionService(key=key)
+    
+    legacy_path = tmp_path / "old.enc"
+    legacy_path.write_bytes(Fernet(key.encode()).encrypt(b"legacy file contents"))
+    
+    service.decrypt_file(str(legacy_path), str(tmp_path / "old.out"))
+    
+    assert (tmp_path / "old.out").read_bytes() == b"legacy file contents"
+
+
+def test_batch_encryption_roundtrip():
+    """Test the batch and bytes APIs against the single-value format."""
+    key = generate_encryption_key()
+    service = EncryptionService(key=key)
+    
+    values = [f"PHI field {i}" for i in range(5)]
+    encrypted = service.encrypt_many(values)
+    
+    assert service.decrypt_many(encrypted) == values
+    # Batch output is interchangeable with the single-value API
+    assert service.decrypt(encrypted[0]) == values[0]
+    assert service.decrypt_bytes(service.encrypt_bytes(b"raw")) == b"raw"